@@ -1,6 +1,7 @@
-from abc import ABC, abstractmethod
 from collections import namedtuple
 import re
+import sys
+from weakref import WeakValueDictionary
 from typing import (
         Any,
         Callable,
@@ -14,35 +15,34 @@ from typing import (
         overload,
     )
 
-FOLDER_MIME_TYPE: Literal['application/vnd.google-apps.folder'] = 'application/vnd.google-apps.folder'
-T = TypeVar('T')
+FOLDER_MIME_TYPE: Literal['application/vnd.google-apps.folder'] = sys.intern('application/vnd.google-apps.folder')
 
+_ID_RE = re.compile(r'[-\w]{25,}')
+_ID_FULLMATCH = _ID_RE.fullmatch
 
-class Validator(ABC, Generic[T]):
-    def __set_name__(self, owner: type[object], name: str):
-        self.private_name = '_' + name
 
-    @overload
-    def __get__(self, obj: None, objtype: None) -> 'Validator[T]':
-        ...
+class Validator:
+    __slots__ = ('private_name',)
 
-    @overload
-    def __get__(self, obj: object, objtype: type[object]) -> T:
-        ...
+    def __set_name__(self, owner: type[object], name: str):
+        self.private_name = '_' + name
 
-    def __get__(self, obj: object | None, objtype: type[object] | None = None) -> 'Validator[T]' | T:
+    def __get__(self, obj: object | None, objtype: type[object] | None = None) -> Any:
+        if obj is None:
+            return self
         return getattr(obj, self.private_name)
 
     def __set__(self, obj: object, value: Any):
         if self.validate(value):
             setattr(obj, self.private_name, value)
 
-    @abstractmethod
-    def validate(self, value: Any) -> TypeGuard[T]:
-        pass
+    def validate(self, value: Any) -> bool:
+        raise NotImplementedError
 
 
-class String(Validator[str]):
+class String(Validator):
+    __slots__ = ('minlen', 'maxlen', 'predicate', 'pattern', '_fullmatch', '_predicate')
+
     def __init__(
             self,
             minlen: int = 0, 
@@ -54,25 +54,29 @@ class String(Validator[str]):
         self.maxlen = maxlen
         self.predicate = predicate
         self.pattern = pattern
+        self._predicate = predicate
+        self._fullmatch = pattern.fullmatch if pattern is not None else None
 
-    def validate(self, value: Any) -> TypeGuard[str]:
+    def validate(self, value: Any) -> bool:
         if not isinstance(value, str):
             raise TypeError(f"{value} must be a str, got {type(value)}.")
         if (length := len(value)) < self.minlen:
             raise ValueError(f"Length of string must be at least {self.minlen}, got {length}")
         if length > self.maxlen:
             raise ValueError(f"Length of string must be at most {self.minlen}, got {length}")
-        if self.predicate is not None and not self.predicate(value):
+        if self._predicate is not None and not self._predicate(value):
             raise ValueError(f"String didn't match the predicate.")
-        if self.pattern is not None and self.pattern.fullmatch(value) is None:
+        if self._fullmatch is not None and self._fullmatch(value) is None:
             raise ValueError(f"String didn't match the pattern.")
         return True
 
-class NonNegativeInt(Validator[int]):
+class NonNegativeInt(Validator):
+    __slots__ = ('maxval',)
+
     def __init__(self, maxval: int = None) -> None:
         self.maxval = maxval
 
-    def validate(self, value: Any) -> TypeGuard[int]:
+    def validate(self, value: Any) -> bool:
         if not isinstance(value, int):
             raise TypeError(f"Expected int, got {type(value)}")
         if value < 0:
@@ -82,36 +86,107 @@ class NonNegativeInt(Validator[int]):
         return True
 
 class Item:
-    pattern: ClassVar[re.Pattern] = re.compile(r'[-\w]{25,}')
-    checksum: ClassVar[re.Pattern] = re.compile(r'[a-fA-F\d]{32}')
+    __slots__ = ()
+    pattern: ClassVar[re.Pattern] = _ID_RE
 
     @classmethod
     def is_valid_id(cls, id_: str) -> TypeGuard[str]:
-        return cls.pattern.fullmatch(id_) is not None
+        return _ID_FULLMATCH(id_) is not None
 
 F = TypeVar('F', bound=Item)
 
-class IDMeta(type):
-    @classmethod
-    def __isinstancecheck__(cls, other):
-        return isinstance(other, str) and Item.pattern.fullmatch(other) is not None
+class ItemID(str, Generic[F]):
+    __slots__ = ('type', 'is_folder', '__weakref__')
 
-class ItemID(str, Generic[F], metaclass=IDMeta):
     def __new__(cls, arg: str, /, *, type: type[F]) -> 'ItemID[F]':
         if not Item.is_valid_id(arg):
             raise TypeError("Not a valid ItemID.")
-        self = super().__new__(cls, arg)
+        self = str.__new__(cls, arg)
+        self.type = type
+        self.is_folder = type is Folder
         return self
 
-    def __init__(self, arg, /, *, type: type[F]):
+    def __reduce__(self) -> tuple[Callable[..., 'ItemID[F]'], tuple[Any, ...]]:
+        # Rebuild without validating, as parent ids (e.g. a root folder id)
+        # may be shorter than `Item.pattern` allows.
+        return _unpickle_item_id, (type(self), str(self), self.type)
+
+    @classmethod
+    def looks_like_id(cls, other: Any) -> TypeGuard[str]:
+        """
+        Check whether `other` is a str shaped like a Drive item id.
+        """
+        return isinstance(other, str) and Item.is_valid_id(other)
+
+    @classmethod
+    def _unchecked(cls, arg: str, /, *, type: type[F]) -> 'ItemID[F]':
+        """
+        Build an ItemID without validating `arg`, for ids from the Drive API.
+        """
+        self = str.__new__(cls, arg)
         self.type = type
+        self.is_folder = type is Folder
+        return self
+
+def _unpickle_item_id(cls: type[ItemID[F]], arg: str, type: type[F]) -> ItemID[F]:
+    if cls is ItemID and type is Folder:
+        return _folder_id(arg)
+    return cls._unchecked(arg, type=type)
+
+# Parent ids repeat for every item in a folder, so share one ItemID per id
+# for as long as some item still refers to it.
+_folder_ids: 'WeakValueDictionary[str, ItemID[Folder]]' = WeakValueDictionary()
+
+def _folder_id(id: str) -> 'ItemID[Folder]':
+    try:
+        return _folder_ids[id]
+    except KeyError:
+        _folder_ids[id] = folder_id = ItemID._unchecked(id, type=Folder)
+        return folder_id
+
+def _validate_file_fields(id: Any, mimeType: Any, size: Any, md5checksum: Any) -> bytes:
+    """
+    Validate all the fields of a File in one pass, and return the raw md5 digest.
+    """
+    if not isinstance(id, str):
+        raise TypeError(f"{id} must be a str, got {type(id)}.")
+    if _ID_FULLMATCH(id) is None:
+        raise ValueError(f"String didn't match the pattern.")
+    if not isinstance(mimeType, str):
+        raise TypeError(f"{mimeType} must be a str, got {type(mimeType)}.")
+    if mimeType == FOLDER_MIME_TYPE:
+        raise ValueError(f"File got folder mimeType.")
+    if not isinstance(size, int):
+        raise TypeError(f"Expected int, got {type(size)}")
+    if size < 0:
+        raise ValueError(f"value must not be negative, got {size}.")
+    if not isinstance(md5checksum, str):
+        raise TypeError(f"{md5checksum} must be a str, got {type(md5checksum)}.")
+    # Non-hex digits, whitespace and wrong lengths all get the same error.
+    try:
+        md5 = bytes.fromhex(md5checksum)
+    except ValueError:
+        md5 = b''
+    if len(md5checksum) != 32 or len(md5) != 16:
+        raise ValueError(f"md5checksum must be 32 hex digits, got {md5checksum}.")
+    return md5
+
+def _validate_folder_fields(id: Any, mimeType: Any) -> None:
+    """
+    Validate all the fields of a Folder in one pass.
+    """
+    if not isinstance(id, str):
+        raise TypeError(f"{id} must be a str, got {type(id)}.")
+    if _ID_FULLMATCH(id) is None:
+        raise ValueError(f"String didn't match the pattern.")
+    if not isinstance(mimeType, str):
+        raise TypeError(f"{mimeType} must be a str, got {type(mimeType)}.")
+    # FOLDER_MIME_TYPE is interned, so an identity check is enough.
+    if sys.intern(str(mimeType)) is not FOLDER_MIME_TYPE:
+        raise ValueError(f"Folder got non-folder mimeType {mimeType}.")
 
 class File(Item):
-    __slots__ = ('_id', 'name', '_mimeType', 'parents', '_size', '_md5checksum', 'trashed', 'kind')
-    id = String(pattern=Item.pattern)
-    mimeType = String(predicate=FOLDER_MIME_TYPE.__ne__)
-    size = NonNegativeInt()
-    md5checksum = String(pattern=Item.checksum)
+    __slots__ = ('id', 'name', 'mimeType', 'parents', 'size', 'md5checksum', 'trashed', 'kind', '_hash')
 
     def __init__(
         self,
@@ -123,28 +198,29 @@ class File(Item):
         size: str | int,
         md5checksum: str,
     ):
+        size = int(size)
+        md5 = _validate_file_fields(id, mimeType, size, md5checksum)
         self.id = id
+        self._hash = hash(id)
         self.kind: Literal['File'] = 'File'
         self.name = name
-        self.mimeType = mimeType
-        self.parents = [ItemID(parent, type=Folder) for parent in parents]
-        self.size = int(size)
-        self.md5checksum = md5checksum
+        self.mimeType = sys.intern(str(mimeType))
+        self.parents = [_folder_id(parent) for parent in parents]
+        self.size = size
+        self.md5checksum = md5
         self.trashed = trashed
 
     def __hash__(self):
-        return hash(self.id)
+        return self._hash
 
     def __eq__(self, other) -> bool:
-        if not issubclass(type(other), type(self)):
+        if type(other) is not type(self):
             return NotImplemented
         return self.md5checksum == other.md5checksum
     
 
 class Folder(Item):
-    id = String(pattern=Item.pattern)
-    mimeType = String(predicate=FOLDER_MIME_TYPE.__eq__)
-    __slots__ = ('_id', 'name', '_mimeType', 'parents', 'trashed', 'kind')
+    __slots__ = ('id', 'name', 'mimeType', 'parents', 'trashed', 'kind', '_hash')
 
     def __init__(
         self,
@@ -154,18 +230,20 @@ class Folder(Item):
         trashed: bool,
         mimeType: str = FOLDER_MIME_TYPE,
     ):
+        _validate_folder_fields(id, mimeType)
         self.id = id
+        self._hash = hash(id)
         self.kind: Literal['Folder'] = 'Folder'
         self.name = name
-        self.mimeType = mimeType
-        self.parents = [ItemID(parent, type=Folder) for parent in parents]
+        self.mimeType = FOLDER_MIME_TYPE
+        self.parents = [_folder_id(parent) for parent in parents]
         self.trashed = trashed
 
     def __hash__(self):
-        return hash(self.id)
+        return self._hash
 
     def __eq__(self, other):
-        if not issubclass(type(other), type(self)):
+        if type(other) is not type(self):
             return NotImplemented
         return self.id == other.id
 
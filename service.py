@@ -1,40 +1,54 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from logging import Logger
 from pathlib import Path
 from os import PathLike
-from typing import ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from google.auth.transport.requests import Request    # type: ignore
-from google.oauth2.credentials import Credentials    # type: ignore
-from google_auth_oauthlib.flow import InstalledAppFlow    # type: ignore
-from googleapiclient.discovery import Resource, build    # type: ignore
-from googleapiclient.errors import HttpError    # type: ignore
-import rich
-from rich.console import Console
-from rich.progress import Progress, ProgressColumn, SpinnerColumn, TimeElapsedColumn
+# The Google client and rich stacks are slow to import, so they are
+# imported where first needed; these names are for annotations only.
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials    # type: ignore
+    from googleapiclient.discovery import Resource    # type: ignore
+    from googleapiclient.errors import HttpError    # type: ignore
+    from googleapiclient.http import BatchHttpRequest    # type: ignore
+    from rich.console import Console
+    from rich.progress import ProgressColumn
 
 
 
 class DriveService:
     max_search_pages: ClassVar[int] = 10
     page_size: ClassVar[int] = 100
-    default_columns: ClassVar[list[ProgressColumn]] = [
-        SpinnerColumn(),
-        *Progress.get_default_columns(),
-        TimeElapsedColumn(),
-        # ConditionalTransferSpeedColumn(),
-    ]
+    # Drive rejects batches of more than 100 calls.
+    batch_size: ClassVar[int] = 100
+    file_fields: ClassVar[str] = 'id, name, mimeType, parents, trashed, size, md5Checksum'
+
+    @staticmethod
+    def default_columns() -> list['ProgressColumn']:
+        from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
+        return [
+            SpinnerColumn(),
+            *Progress.get_default_columns(),
+            TimeElapsedColumn(),
+            # ConditionalTransferSpeedColumn(),
+        ]
 
     def __init__(
         self,
         *,
         log: bool = False,
         logger: Logger | None = None,
-        console: Console | None = None,
+        console: 'Console | None' = None,
         db_path: PathLike | str | bytes | None = None
     ) -> None:
-        self.console = rich.get_console() if console is None else console
-        self.progress = Progress(*self.default_columns)
+        from rich.progress import Progress
+        if console is None:
+            import rich
+            console = rich.get_console()
+        self.console = console
+        self.progress = Progress(*self.default_columns())
         self.log = log
         # self.db_path: PathLike | str | bytes
         # self.logger = Logger
@@ -44,9 +58,15 @@ class DriveService:
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        self.service.close()
+        # Closing must not build the service (and run the OAuth flow) if no
+        # Drive call was made.
+        if 'service' in self.__dict__:
+            self.service.close()
         self.progress.stop()
 
+        if exc_value is None:
+            return None
+        from googleapiclient.errors import HttpError    # type: ignore
         if isinstance(exc_value, HttpError):
             self.progress.log(
                 "[red]ERROR:[/red] While processing request.",
@@ -56,14 +76,78 @@ class DriveService:
             return True
 
     @cached_property
-    def service(self) -> Resource:
+    def service(self) -> 'Resource':
+        from googleapiclient.discovery import build    # type: ignore
         return build("drive", "v3", credentials=self.creds)
 
+    def batch(
+        self,
+        callback: Callable[[str, Any, 'HttpError | None'], None] | None = None,
+    ) -> 'BatchHttpRequest':
+        return self.service.new_batch_http_request(callback=callback)
+
+    def get_files(
+        self,
+        file_ids: Iterable[str],
+        callback: Callable[[str, Any, 'HttpError | None'], None],
+    ) -> None:
+        """
+        Fetch metadata of many files, `batch_size` calls per HTTP round-trip.
+        `callback` receives (file_id, response, exception) once for every distinct file.
+        """
+        files = self.service.files()
+        batch = self.batch(callback)
+        pending = 0
+        # A batch rejects a repeated request id, so fetch each file once.
+        for file_id in dict.fromkeys(file_ids):
+            batch.add(files.get(fileId=file_id, fields=self.file_fields), request_id=file_id)
+            pending += 1
+            if pending == self.batch_size:
+                batch.execute()
+                batch = self.batch(callback)
+                pending = 0
+        if pending:
+            batch.execute()
+
+    def list_files(self, query: str | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Yield metadata of files matching `query`, at most `max_search_pages` pages.
+        The next page is fetched in the background while the current one is consumed.
+        """
+        files = self.service.files()
+        request = files.list(
+            q=query,
+            pageSize=self.page_size,
+            fields=f'nextPageToken, files({self.file_fields})',
+        )
+        # httplib2 is not thread-safe, so the worker gets an http of its own
+        # and the caller stays free to use self.service while iterating.
+        http = self._authorized_http()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(request.execute, http=http)
+            for page in range(self.max_search_pages):
+                response = future.result()
+                request = files.list_next(request, response)
+                if request is not None and page + 1 < self.max_search_pages:
+                    future = pool.submit(request.execute, http=http)
+                yield from response.get('files', [])
+                if request is None:
+                    break
+
+    def _authorized_http(self) -> Any:
+        import httplib2    # type: ignore
+        from google_auth_httplib2 import AuthorizedHttp    # type: ignore
+        return AuthorizedHttp(self.creds, http=httplib2.Http())
+
     @cached_property
-    def creds(self) -> Credentials:
+    def creds(self) -> 'Credentials':
         """
         Check for valid credentials, and generate token.
         """
+        from google.auth.transport.requests import Request    # type: ignore
+        from google.oauth2.credentials import Credentials    # type: ignore
+        from google_auth_oauthlib.flow import InstalledAppFlow    # type: ignore
+
         assert isinstance(TOKEN, str) and isinstance(CREDS, str), \
             "Must Provide TOKEN and CREDS path."
         token = Path(TOKEN).expanduser()
@@ -0,0 +1,19 @@
+import pytest
+
+from files import FOLDER_MIME_TYPE, File, Folder
+
+
+def test_str_subclass_mime_types_are_accepted():
+    class S(str):
+        pass
+
+    file = File('f' * 30, 'a', S('text/plain'), [], False, 1, 'a' * 32)
+    folder = Folder('d' * 30, 'b', [], False, S(FOLDER_MIME_TYPE))
+    assert type(file.mimeType) is str and file.mimeType == 'text/plain'
+    assert folder.mimeType is FOLDER_MIME_TYPE
+
+
+@pytest.mark.parametrize('md5checksum', ['a' * 31, 'a' * 30 + '  ', 'aa ' * 10 + 'aa', 'g' * 32])
+def test_bad_md5checksum_reports_one_error(md5checksum):
+    with pytest.raises(ValueError, match='md5checksum must be 32 hex digits'):
+        File('f' * 30, 'a', 'text/plain', [], False, 1, md5checksum)
@@ -0,0 +1,94 @@
+import pytest
+
+from service import DriveService
+
+
+class StubRequest:
+    def __init__(self, files, page):
+        self.files = files
+        self.page = page
+
+    def execute(self, http=None):
+        self.files.executed.append((self.page, http))
+        token = self.page + 1 if self.page + 1 < self.files.npages else None
+        return {'files': [f'{self.page}-{i}' for i in range(2)], 'nextPageToken': token}
+
+
+class StubFiles:
+    def __init__(self, npages=0):
+        self.npages = npages
+        self.executed = []
+
+    def list(self, **kwargs):
+        return StubRequest(self, 0)
+
+    def list_next(self, request, response):
+        token = response['nextPageToken']
+        return None if token is None else StubRequest(self, token)
+
+    def get(self, fileId, fields):
+        return fileId
+
+
+class StubBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = {}
+
+    def add(self, request, request_id):
+        if request_id in self.requests:
+            raise KeyError(request_id)
+        self.requests[request_id] = request
+
+    def execute(self):
+        self.service.batches.append(list(self.requests))
+        for request_id, request in self.requests.items():
+            self.callback(request_id, request, None)
+
+
+class StubService:
+    def __init__(self, npages=0):
+        self.stub_files = StubFiles(npages)
+        self.batches = []
+
+    def files(self):
+        return self.stub_files
+
+    def new_batch_http_request(self, callback=None):
+        return StubBatch(self, callback)
+
+
+@pytest.fixture
+def drive(monkeypatch):
+    # Skip __init__, which needs rich; only the Drive call paths are tested.
+    drive = DriveService.__new__(DriveService)
+    monkeypatch.setattr(DriveService, '_authorized_http', lambda self: 'worker-http')
+    return drive
+
+
+def test_get_files_batches_each_distinct_id_once(drive, monkeypatch):
+    monkeypatch.setattr(DriveService, 'batch_size', 2)
+    drive.service = StubService()
+    seen = []
+
+    drive.get_files(['a', 'b', 'a', 'c', 'b'], lambda *args: seen.append(args))
+
+    assert drive.service.batches == [['a', 'b'], ['c']]
+    assert seen == [('a', 'a', None), ('b', 'b', None), ('c', 'c', None)]
+
+
+def test_list_files_reads_every_page(drive):
+    drive.service = StubService(npages=3)
+
+    assert list(drive.list_files()) == ['0-0', '0-1', '1-0', '1-1', '2-0', '2-1']
+    assert drive.service.stub_files.executed == [(0, 'worker-http'), (1, 'worker-http'), (2, 'worker-http')]
+
+
+def test_list_files_stops_at_max_search_pages(drive, monkeypatch):
+    monkeypatch.setattr(DriveService, 'max_search_pages', 2)
+    drive.service = StubService(npages=5)
+
+    assert list(drive.list_files()) == ['0-0', '0-1', '1-0', '1-1']
+    # No page past the limit is prefetched.
+    assert [page for page, _ in drive.service.stub_files.executed] == [0, 1]
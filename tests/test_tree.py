@@ -0,0 +1,116 @@
+import pytest
+
+from files import File, Folder, ItemID
+from tree import FileTree
+
+
+def test_dump_load_round_trip_with_short_parent_id(tmp_path):
+    # The root folder id of My Drive is shorter than a regular item id.
+    root_id = '0AABBCCDDUk9PVA'
+    file_id = ItemID('f' * 30, type=File)
+    tree = FileTree()
+    node = tree[file_id]
+    node.info = File(file_id, 'name', 'text/plain', [root_id], False, 3, 'a' * 32)
+
+    path = tmp_path / 'tree.pkl.gz'
+    tree.dump(path)
+    loaded = FileTree.load(path)
+
+    (key, loaded_node), = loaded.items()
+    assert type(key) is ItemID and key == file_id
+    assert key.type is File and not key.is_folder
+    parent, = loaded_node.info.parents
+    assert parent == root_id
+    assert parent.type is Folder and parent.is_folder
+    assert loaded_node.info == node.info
+
+
+def test_missing_subtree_placeholder_is_read_only():
+    tree = FileTree()
+    placeholder = tree['missing']
+    mutations = [
+        lambda: placeholder.__setitem__('a', 1),
+        lambda: placeholder.__delitem__('a'),
+        lambda: placeholder.__ior__({'a': 1}),
+        lambda: placeholder.setdefault('a', 1),
+        lambda: placeholder.update(a=1),
+        lambda: placeholder.pop('a'),
+        placeholder.popitem,
+        placeholder.clear,
+    ]
+    for mutate in mutations:
+        with pytest.raises(TypeError):
+            mutate()
+    assert 'missing' not in tree
+    assert FileTree()['other'] == {}
+
+
+def test_failed_dump_keeps_previous_snapshot(tmp_path):
+    path = tmp_path / 'tree.pkl.gz'
+    FileTree().dump(path)
+    tree = FileTree()
+    tree[ItemID('f' * 30, type=File)].info = lambda: None    # not picklable
+
+    with pytest.raises(Exception):
+        tree.dump(path)
+
+    assert FileTree.load(path) == {}
+    assert [p.name for p in tmp_path.iterdir()] == ['tree.pkl.gz']
+
+
+def test_loaded_parent_ids_are_shared_with_new_items(tmp_path):
+    parent_id = 'p' * 30
+    file_id = ItemID('f' * 30, type=File)
+    tree = FileTree()
+    tree[file_id].info = File(file_id, 'a', 'text/plain', [parent_id], False, 1, 'a' * 32)
+
+    path = tmp_path / 'tree.pkl.gz'
+    tree.dump(path)
+    del tree
+    loaded = FileTree.load(path)
+
+    other = File('g' * 30, 'b', 'text/plain', [parent_id], False, 1, 'b' * 32)
+    assert loaded[file_id].info.parents[0] is other.parents[0]
+
+
+def test_delitem_updates_every_ancestor():
+    tree = FileTree()
+    root = tree[ItemID('r' * 30, type=Folder)]
+    sub = tree[ItemID('s' * 30, type=Folder)]
+    file_id = ItemID('f' * 30, type=File)
+    node = tree[file_id]
+    node.size = 10
+    node.ancestors = [root, sub]
+    root.size, root.nitems = 25, 3
+    sub.size, sub.nitems = 10, 1
+
+    del tree[file_id]
+
+    assert file_id not in tree
+    assert (root.size, root.nitems) == (15, 2)
+    assert (sub.size, sub.nitems) == (0, 0)
+    with pytest.raises(KeyError):
+        del tree[file_id]
+    assert file_id not in tree
+
+
+def test_collect_md5s_groups_duplicates_across_subtrees():
+    tree = FileTree()
+    folder_id = ItemID('d' * 30, type=Folder)
+    folder = tree.mkchild('root')[folder_id]
+    folder.info = Folder(folder_id, 'folder', [], False)
+
+    top_id = ItemID('a' * 30, type=File)
+    tree.mkchild('other')[top_id].info = File(top_id, 'a', 'text/plain', [], False, 1, '1' * 32)
+    nested_id = ItemID('b' * 30, type=File)
+    folder.items[nested_id].info = File(nested_id, 'b', 'text/plain', [folder_id], False, 1, '1' * 32)
+    unique_id = ItemID('c' * 30, type=File)
+    folder.items[unique_id].info = File(unique_id, 'c', 'text/plain', [folder_id], False, 1, '2' * 32)
+    folder.items[ItemID('e' * 30, type=File)]    # node without info
+
+    md5s = tree.collect_md5s()
+
+    assert {md5: sorted(ids) for md5, ids in md5s.items()} == {
+        bytes.fromhex('1' * 32): [top_id, nested_id],
+        bytes.fromhex('2' * 32): [unique_id],
+    }
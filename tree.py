@@ -1,72 +1,116 @@
-from functools import singledispatchmethod
-from typing import TypeVar, Literal, NewType, TypedDict, NotRequired
+import gzip
+import os
+from os import PathLike
+import pickle
+import tempfile
+from typing import TypeVar, Literal, NewType
 
 from files import File, Folder, Generic, ItemID, Item, overload
 
 T = TypeVar('T', File, Folder)
 
-class ItemData(TypedDict, Generic[T]):
-    info: T
-    ancestors: list[Folder]
-    items: NotRequired['FileTree']
-    nitems: NotRequired[int]
-    size: int
-
-class ItemDataDict(dict):
-    def __missing__(self, key):
-        if key == 'ancestors':
-            return list()
-        elif key == 'items':
-            return FileTree()
-        elif key == 'nitems':
-            return 0
-        elif key == 'size':
-            return 0
+class ItemNode(Generic[T]):
+    __slots__ = ('info', 'ancestors', 'items', 'nitems', 'size')
 
-class FileTree(dict, Generic[T]):
-    @singledispatchmethod
-    def __overloaded_missing__(self, key):
-        raise NotImplementedError("Keys must be string.")
+    def __init__(self, *, folder: bool = False) -> None:
+        self.info: T | None = None
+        self.ancestors: list['ItemNode[Folder]'] = []
+        self.items: 'FileTree | None' = FileTree() if folder else None
+        self.nitems: int = 0
+        self.size: int = 0
 
-    @__overloaded_missing__.register
-    def _(self, key: ItemID[T]) -> ItemData[T]:
-        self[key] = dict.fromkeys(['info', 'ancestors', 'size'])
-        self[key]['ancestors'] = list[Folder]()
-        if isinstance(key, ItemID) and key.type == Folder:
-            self[key]['items'] = type(self)()
-            self[key]['nitems'] = 0
-        self[key]['size'] = 0
-        return self[key]
-
-    @__overloaded_missing__.register
-    def _(self, key: str) -> 'FileTree':
-        self[key] = type(self)()
-        return self[key]
+class FileTree(dict, Generic[T]):
+    __slots__ = ()
 
     @overload
-    def __missing__(self, key: ItemID[Folder]) -> ItemData[Folder]:
+    def __missing__(self, key: ItemID[Folder]) -> ItemNode[Folder]:
         ...
 
     @overload
-    def __missing__(self, key: ItemID[File]) -> ItemData[File]:
+    def __missing__(self, key: ItemID[File]) -> ItemNode[File]:
         ...
 
     @overload
     def __missing__(self, key: str) -> 'FileTree':
         ...
 
-    def __missing__(self, key: ItemID | str) -> ItemData | 'FileTree':
-        return self.__overloaded_missing__(key)
+    def __missing__(self, key: ItemID | str) -> 'ItemNode | FileTree':
+        if isinstance(key, ItemID):
+            self[key] = node = ItemNode(folder=key.is_folder)
+            return node
+        if isinstance(key, str):
+            # Reading a missing subtree allocates nothing; use mkchild to create one.
+            return _EMPTY
+        raise NotImplementedError("Keys must be string.")
+
+    def mkchild(self, key: str) -> 'FileTree':
+        """
+        Return the subtree at `key`, creating it if it does not exist.
+        """
+        tree = self.get(key)
+        if tree is None:
+            self[key] = tree = type(self)()
+        return tree
+
+    def collect_md5s(self) -> dict[bytes, list[ItemID[File]]]:
+        """
+        Map the md5 digest of every file in the tree to the ids of the files having it.
+        """
+        md5s: dict[bytes, list[ItemID[File]]] = {}
+        stack: list[FileTree] = [self]
+        while stack:
+            for key, val in stack.pop().items():
+                if not isinstance(val, ItemNode):
+                    stack.append(val)
+                elif val.items is not None:
+                    stack.append(val.items)
+                elif val.info is not None:
+                    md5s.setdefault(val.info.md5checksum, []).append(key)
+        return md5s
+
+    def dump(self, path: PathLike | str | bytes) -> None:
+        """
+        Save a snapshot of the tree to `path`, so it need not be listed again.
+        """
+        # Write next to `path` and swap it in, so a crash never leaves a truncated snapshot.
+        path = os.fsdecode(path)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or None)
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=1) as f:
+                pickle.dump(self, f, protocol=5)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: PathLike | str | bytes) -> 'FileTree':
+        """
+        Load a snapshot saved by `dump`.
+        """
+        with gzip.open(path, 'rb') as f:
+            tree = pickle.load(f)
+        if not isinstance(tree, cls):
+            raise TypeError(f"Expected a pickled {cls.__name__}, got {type(tree)}.")
+        return tree
 
     def __delitem__(self, key):
-        val = self[key]
-        if isinstance(val, type(self)):
-            if not val['ancestors']:
-                del self[key]
-                return
-            for ancestor in val['ancestors']:
-                ancestor['size'] -= val['size']
-            ancestor['nitems'] -= 1
-            if ancestor['nitems'] == 0 and ancestor['size'] == 0:
-                del ancestor
-        del self[key]
+        # pop() neither recurses into __delitem__ nor inserts via __missing__.
+        val = self.pop(key)
+        if isinstance(val, ItemNode):
+            size = val.size
+            for ancestor in val.ancestors:
+                ancestor.size -= size
+                ancestor.nitems -= 1
+
+
+class _EmptyFileTree(FileTree):
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Placeholder subtree is read-only, use FileTree.mkchild.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly  # type: ignore[assignment]
+    setdefault = update = pop = popitem = clear = _readonly  # type: ignore[assignment]
+
+_EMPTY = _EmptyFileTree()